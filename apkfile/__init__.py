@@ -5,11 +5,15 @@ import os
 import shutil
 import subprocess
 import re
+import sys
 import tempfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from zipfile import ZipFile
 from enum import Enum
-from typing import Optional, Tuple, Union, Iterable, Dict, Any, Callable
+from functools import lru_cache
+from typing import Optional, Tuple, Union, Iterable, Iterator, Dict, Any, Callable
 
 __all__ = [
     'ApkFile',
@@ -18,6 +22,7 @@ __all__ = [
     'ApksFile',
     'install_apks',
     'get_raw_aapt',
+    'set_cache_dir',
     'Abi',
     'InstallLocation',
     'SplitType'
@@ -28,9 +33,10 @@ __title__ = 'apkfile'
 __version__ = '0.1.7'
 
 
+@lru_cache(maxsize=None)
 def _get_program_path(program: str) -> str:
     """
-    Helper function to get the path of a program.
+    Helper function to get the path of a program (cached, only successful lookups are stored).
 
     Args:
         program: The name of the program.
@@ -45,6 +51,37 @@ def _get_program_path(program: str) -> str:
     return program_path
 
 
+def _iter_aapt(apk_path: str, aapt_path: Optional[str] = None) -> Iterator[bytes]:
+    """
+    Helper function to run ``aapt d badging`` and stream its output lines as they are written.
+
+    stderr goes to a temporary file and is read only if aapt fails, so a chatty stderr can never block the stdout pipe.
+
+    Args:
+        apk_path: The path to the apk.
+        aapt_path: The path to the aapt executable (If not specified, aapt will be searched in the PATH).
+    Returns:
+        An iterator over the raw output lines of the aapt command, as bytes.
+    Raises:
+        FileNotFoundError: If aapt is not installed.
+        RuntimeError: If the aapt command failed (raised once the output is exhausted).
+    """
+    with tempfile.TemporaryFile() as stderr:
+        try:
+            process = subprocess.Popen([aapt_path or _get_program_path('aapt'), 'd', 'badging', apk_path],
+                                       stdout=subprocess.PIPE, stderr=stderr)
+        except FileNotFoundError as e:
+            raise FileNotFoundError('aapt is not installed! see https://github.com/david-lev/apkfile#install-aapt')
+        with process:
+            lines = []
+            for line in process.stdout:
+                lines.append(line)
+                yield line
+        if process.returncode:
+            stderr.seek(0)
+            raise RuntimeError((stderr.read() or b''.join(lines)).decode('utf-8', 'replace'))
+
+
 def get_raw_aapt(apk_path: str, aapt_path: Optional[str] = None) -> str:
     """
     Helper function to get the raw output of the aapt command.
@@ -58,15 +95,38 @@ def get_raw_aapt(apk_path: str, aapt_path: Optional[str] = None) -> str:
         FileNotFoundError: If aapt is not installed.
         RuntimeError: If the aapt command failed.
     """
-    try:
-        return subprocess.run(
-            [aapt_path or _get_program_path('aapt'), 'd', 'badging', apk_path],
-            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
-            check=True).stdout.decode('utf-8')
-    except subprocess.CalledProcessError as e:
-        raise RuntimeError(e.stderr.decode('utf-8') or e.stdout.decode('utf-8'))
-    except FileNotFoundError as e:
-        raise FileNotFoundError('aapt is not installed! see https://github.com/david-lev/apkfile#install-aapt')
+    return b''.join(_iter_aapt(apk_path=apk_path, aapt_path=aapt_path)).decode('utf-8')
+
+
+_digest_kwargs = {'usedforsecurity': False} if sys.version_info >= (3, 9) else {}  # the keyword is new in 3.9
+
+
+def _file_digests(path: str, *algorithms: str) -> Tuple[str, ...]:
+    """
+    Helper function to hash a file in chunks, without reading it into memory.
+
+    All the algorithms are fed from the same read, so the file is read once however many digests are needed.
+    The digests are file fingerprints, not a security measure, so they are created with ``usedforsecurity=False``
+    on python 3.9+ (md5 is otherwise blocked on FIPS enabled systems).
+
+    Args:
+        path: The path to the file.
+        algorithms: The names of the hashlib algorithms (e.g. ``md5``).
+    Returns:
+        The hex digests of the file, in the order of ``algorithms``.
+    """
+    digests = tuple(hashlib.new(algorithm, **_digest_kwargs) for algorithm in algorithms)
+    with open(path, 'rb') as f:
+        if hasattr(os, 'posix_fadvise'):  # the file is read once front to back, let the kernel read ahead
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        if len(digests) == 1 and hasattr(hashlib, 'file_digest'):  # python 3.11+
+            return (hashlib.file_digest(f, lambda: digests[0]).hexdigest(),)
+        buffer = memoryview(bytearray(1 << 20))
+        for size in iter(lambda: f.readinto(buffer), 0):
+            chunk = buffer[:size]
+            for digest in digests:
+                digest.update(chunk)
+    return tuple(digest.hexdigest() for digest in digests)
 
 
 _dpis = {
@@ -79,6 +139,137 @@ _dpis = {
 }
 
 
+def _language(locale: str) -> str:
+    """Helper function to get the language of a locale (``en-GB`` -> ``en``, ``b+sr+Latn`` -> ``sr``)."""
+    if locale.startswith('b+'):  # bcp-47 resource qualifier
+        return locale[2:].split('+', 1)[0]
+    return locale.split('-', 1)[0]
+
+
+_getprop_pattern = re.compile(r'^\[([^\]\n]+)\]: \[(.*?)\]\r?$', re.MULTILINE | re.DOTALL)  # values can span lines
+
+
+def _stage_apks(paths: Tuple[str, ...], directory: str) -> Tuple[str, ...]:
+    """
+    Helper function to give the apks a ``.apk`` name, adb reads any other argument as a ``pm`` option.
+
+    Paths that already end with ``.apk`` are kept, the others are hard linked (or copied, e.g. across file systems) into
+    ``directory``.
+
+    Args:
+        paths: The paths of the apks.
+        directory: A directory to stage the renamed apks in.
+    Returns:
+        The paths to pass to adb, in the same order as ``paths``.
+    """
+    staged = []
+    for i, path in enumerate(paths):
+        if path.endswith('.apk'):
+            staged.append(path)
+            continue
+        target = os.path.join(directory, f'{i}-{os.path.basename(path)}.apk')
+        try:
+            os.link(path, target)
+        except OSError:
+            shutil.copyfile(path, target)
+        staged.append(target)
+    return tuple(staged)
+
+
+def _install_on_device(
+        adb: str,
+        device: str,
+        apks: Tuple[str, ...],
+        grouped_apks: Optional[Tuple[tuple, ...]],
+        upgrade: bool,
+        installer: Optional[str],
+        originating_uri: Optional[str]
+) -> None:
+    """
+    Helper function to install apks on a single device (see :func:`install_apks`).
+
+    Args:
+        adb: The path to the adb executable.
+        device: The id of the device.
+        apks: The paths of the apks to install when the compatibility is not checked.
+        grouped_apks: The parsed apks, grouped as ``(others, abi_splits, lang_splits, dpi_splits)``, to pick the
+            compatible ones from (``None`` to install ``apks`` as is). ``lang_splits`` are ``(split, languages)``
+            pairs, where ``languages`` is the set of the split's language codes without the region.
+        upgrade: Whether to upgrade the app if it is already installed.
+        installer: The package name of the app that is performing the installation.
+        originating_uri: The URI of the app that is performing the installation.
+    Raises:
+        RuntimeError: If the adb command failed.
+    """
+    spargs = {'stdout': subprocess.PIPE, 'stderr': subprocess.PIPE, 'check': True, 'encoding': 'utf-8'}
+    adb_args = (adb, '-s', device)
+
+    if grouped_apks is not None:
+        others, abi_splits, lang_splits, dpi_splits = grouped_apks
+        apks_to_install = []
+
+        # all the device properties at once, one adb call instead of one per property: [ro.build.version.sdk]: [33]
+        props = dict(_getprop_pattern.findall(subprocess.run((*adb_args, 'shell', 'getprop'), **spargs).stdout))
+
+        device_abis = set()  # every abi the device can run
+        for abi in props.get('ro.product.cpu.abilist', '').split(','):
+            abi = _abis_by_value.get(abi, Abi.UNKNOWN)
+            device_abis.add(abi)
+            device_abis.update(_compatibility_map[abi])
+        device_sdk = int(props.get('ro.build.version.sdk', ''))
+
+        for apk in others:  # contains the base apk and any other apks that are not abis, langs, or dpis
+            if (apk.min_sdk_version is None or apk.min_sdk_version <= device_sdk) and \
+                    (not apk.abis or not device_abis.isdisjoint(apk.abis)):
+                apks_to_install.append(apk.path)
+        if not apks_to_install:
+            return  # skip device if no compatible apks found
+
+        if abi_splits:
+            device_main_abi = _abis_by_value.get(props.get('ro.product.cpu.abi'), Abi.UNKNOWN)
+            abi = next((abi_split for abi_split in abi_splits if device_main_abi == abi_split.abis[0]), None)
+            if abi is None:
+                return
+            apks_to_install.append(abi.path)
+
+        if lang_splits:
+            device_lang = _language(props.get('persist.sys.locale', ''))
+            added_lang = False
+            for lang_split, languages in lang_splits:
+                if device_lang in languages:
+                    apks_to_install.append(lang_split.path)
+                    added_lang = True
+            if not added_lang:  # add all langs if no compatible langs found
+                apks_to_install.extend(lang_split.path for lang_split, _ in lang_splits)
+
+        if dpi_splits:  # add compatible dpi split
+            device_dpi = int(props.get('ro.sf.lcd_density', ''))
+            split_dpis = ((dpi_split, _dpis.get(dpi_split.split_name.rpartition('.')[2])) for dpi_split in dpi_splits)
+            closest = min(((split, dpi) for split, dpi in split_dpis if dpi is not None),
+                          key=lambda split_dpi: abs(split_dpi[1] - device_dpi), default=None)
+            if closest is not None:
+                apks_to_install.append(closest[0].path)
+    else:
+        apks_to_install = apks
+
+    apks_to_install = tuple(dict.fromkeys(apks_to_install))  # an apk that is listed twice is installed once
+    staging_dir = None
+    if not all(path.endswith('.apk') for path in apks_to_install):
+        staging_dir = tempfile.mkdtemp()
+        apks_to_install = _stage_apks(apks_to_install, staging_dir)
+    try:  # adb runs the whole install session (push, create, write and commit) in one command
+        subprocess.run((*adb_args, 'install' if len(apks_to_install) == 1 else 'install-multiple',
+                        *(('-r',) if upgrade else ()),
+                        *(('-i', installer) if installer else ()),
+                        *(('--originating-uri', originating_uri) if originating_uri else ()),
+                        *apks_to_install), **spargs)
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Failed to install apk on device {device}:\n{e.stderr}{e.stdout}") from e
+    finally:
+        if staging_dir is not None:
+            shutil.rmtree(staging_dir)
+
+
 def install_apks(
         apks: Union[str, Iterable[str]],
         check: bool = True,
@@ -88,13 +279,18 @@ def install_apks(
         installer: Optional[str] = None,
         originating_uri: Optional[str] = None,
         adb_path: Optional[str] = None,
-        aapt_path: Optional[str] = None
+        aapt_path: Optional[str] = None,
+        max_workers: Optional[int] = None
 ):
     """
     Install apk(s) on android device(s) using `adb <https://developer.android.com/studio/command-line/adb>`_.
 
+    The apks are installed with ``adb install`` (a single apk) or ``adb install-multiple`` (adb 1.0.40+, platform-tools 28+).
+    Both only accept paths that end with ``.apk``, other paths are linked (or copied) to a temporary ``.apk`` name first.
+
     The ``check`` argument is True by default, which means that the app(s) will be checked if they are compatible with the device(s) before installing them.
     The check is done by comparing ``min_sdk_version``, ``abis``, ``screen_densities`` and ``locales`` with the device(s) capabilities.
+    When more than one device is used, the devices are installed concurrently (see ``max_workers``).
 
     >>> install_apks('path/to/apk.apk')
     >>> install_apks(['path/to/base.apk', 'path/to/split.apk'], device_id='emulator-5554', skip_broken=True)
@@ -111,6 +307,7 @@ def install_apks(
         originating_uri: The URI of the app that is performing the installation.
         adb_path: The path to the adb executable (If not specified, adb will be searched in the ``PATH``).
         aapt_path: The path to the aapt executable (If check is ``True``. If not specified, aapt will be searched in the ``PATH``).
+        max_workers: How many devices to install on at the same time (default: all of them, ``1`` to install one device after another, e.g. if the adb server times out).
 
     Raises:
         FileNotFoundError: If adb is not installed (or if ``check`` is ``True`` and aapt is not installed or the file does not exist).
@@ -124,115 +321,50 @@ def install_apks(
 
     spargs = {'stdout': subprocess.PIPE, 'stderr': subprocess.PIPE, 'check': True}
     if device_id is None:
-        devices = tuple(line.split("\t")[0] for line in subprocess.run(
+        devices = tuple(line.split(b'\t', 1)[0].decode() for line in subprocess.run(
             (adb, 'devices'), **spargs
-        ).stdout.decode('utf-8').strip().split("\n")[1:] if line.endswith('device'))
+        ).stdout.splitlines()[1:] if line.endswith(b'device'))
     else:
         devices = (device_id,)
 
-    for device in devices:
-        adb_args = (adb, '-s', device)
-        tmp_path = subprocess.run(
-            (*adb_args, 'shell', 'mktemp', '-d', '--tmpdir=/data/local/tmp'), **spargs
-        ).stdout.decode('utf-8').strip()
-
-        if check:
-            all_apks = []
-            for apk in ((apks,) if isinstance(apks, str) else apks):
-                try:
-                    all_apks.append(ApkFile(path=apk, aapt_path=aapt_path))
-                except FileExistsError:
-                    if not skip_broken:
-                        raise
-            if not all_apks:  # all apks are broken
-                return
-            lang_splits = tuple(apk for apk in all_apks if apk.split_type == SplitType.LANGUAGE)
-            dpi_splits = tuple(apk for apk in all_apks if apk.split_type == SplitType.DPI)
-            abi_splits = tuple(apk for apk in all_apks if apk.split_type == SplitType.ABI)
-            others = filter(lambda a: a not in (*lang_splits, *dpi_splits, *abi_splits), all_apks)
-
-            apks_to_install: Dict[str, int] = {}
-
-            device_abis = (Abi(abi) for abi in subprocess.run(
-                (*adb_args, 'shell', 'getprop', 'ro.product.cpu.abilist'), **spargs
-            ).stdout.decode('utf-8').strip().split(','))
-            device_sdk = int(subprocess.run(
-                (*adb_args, 'shell', 'getprop', 'ro.build.version.sdk'), **spargs
-            ).stdout.decode('utf-8').strip())
-
-            for apk in others:  # contains the base apk and any other apks that are not abis, langs, or dpis
-                if (apk.min_sdk_version is None or apk.min_sdk_version <= device_sdk) and \
-                        (not apk.abis or any(device_abi.is_compatible_with(apk_abi) for apk_abi in
-                                             apk.abis for device_abi in device_abis)):
-                    apks_to_install[apk.path] = apk.size
-            if not apks_to_install:
-                continue  # skip device if no compatible apks found
-
-            if abi_splits:
-                device_main_abi = Abi(subprocess.run(
-                    (*adb_args, 'shell', 'getprop', 'ro.product.cpu.abi'), **spargs
-                ).stdout.decode('utf-8').strip())
-                abi = next((abi_split for abi_split in abi_splits if device_main_abi == abi_split.abis[0]), None)
-                if abi is None:
-                    continue
-                apks_to_install[abi.path] = abi.size
-
-            if lang_splits:
-                device_lang = subprocess.run(
-                    (*adb_args, 'shell', 'getprop', 'persist.sys.locale'), **spargs
-                ).stdout.decode('utf-8').strip().split('-')[0]
-                added_lang = False
-                for lang_split in lang_splits:
-                    if any(device_lang in lang for lang in lang_split.langs):
-                        apks_to_install[lang_split.path] = lang_split.size
-                        added_lang = True
-                if not added_lang:  # add all langs if no compatible langs found
-                    for lang_split in lang_splits:
-                        apks_to_install[lang_split.path] = lang_split.size
-
-            if dpi_splits:  # add compatible dpi split
-                device_dpi = int(subprocess.run(
-                    (*adb_args, 'shell', 'getprop', 'ro.sf.lcd_density'), **spargs
-                ).stdout.decode('utf-8').strip())
-                closest_dpi = None
-                for dpi_split in dpi_splits:
-                    dpi = _dpis.get(dpi_split.split_name.split('.')[-1])
-                    if dpi is not None and (closest_dpi is None or abs(dpi - device_dpi) <
-                                            abs(closest_dpi - device_dpi)):
-                        closest_dpi = dpi
-                        split = dpi_split
-                if closest_dpi is not None:
-                    apks_to_install[split.path] = split.size
-        else:
-            apks_to_install = {
-                apk_path: os.path.getsize(apk_path)
-                for apk_path in ((apks,) if isinstance(apks, str) else apks)
-            }
+    apk_paths = (apks,) if isinstance(apks, str) else tuple(apks)
+    if check:  # parse the apks once (concurrently), not once per device
+        all_apks = [apk for apk in _parse_apks(apk_paths, aapt_path=aapt_path, skip_broken=skip_broken)
+                    if apk is not None]
+        if not all_apks:  # all apks are broken
+            return
+        split_types = {SplitType.LANGUAGE: [], SplitType.DPI: [], SplitType.ABI: []}
+        others = []
+        for apk in all_apks:  # split_type is computed once per apk
+            split_types.get(apk.split_type, others).append(apk)
+        lang_splits = tuple((split, frozenset(map(_language, split.langs)))  # shared by all devices
+                            for split in split_types[SplitType.LANGUAGE])
+        dpi_splits = tuple(split_types[SplitType.DPI])
+        abi_splits = tuple(split_types[SplitType.ABI])
+
+    grouped_apks = (others, abi_splits, lang_splits, dpi_splits) if check else None
+    install_args = (apk_paths, grouped_apks, upgrade, installer, originating_uri)
+    if len(devices) < 2 or max_workers == 1:
+        for device in devices:
+            _install_on_device(adb, device, *install_args)
+        return
+
+    # the devices get their own threads, the adb commands of different devices don't wait for each other
+    with ThreadPoolExecutor(max_workers=max_workers or len(devices)) as executor:
+        futures = [executor.submit(_install_on_device, adb, device, *install_args) for device in devices]
+    errors = []
+    for future in futures:
         try:
-            subprocess.run((*adb_args, 'push', *apks_to_install, tmp_path), **spargs)
-            session_id = re.search(r'\d+', subprocess.run(
-                (*adb_args, 'shell', 'pm', 'install-create',
-                 ('-r' if upgrade else ''), *(('-i', installer) if installer else ()),
-                 *(('--originating-uri', originating_uri) if originating_uri else ()),
-                 '-S', str(sum(apks_to_install.values()))), **spargs
-            ).stdout.decode('utf-8')).group(0)
-
-            for idx, (apk, size) in enumerate(apks_to_install.items()):
-                basename = os.path.basename(apk)
-                subprocess.run(
-                    (*adb_args, 'shell', 'pm', 'install-write', '-S',
-                     str(size), session_id, str(idx), f'{tmp_path}/{basename}'), **spargs
-                )
-            subprocess.run((*adb_args, 'shell', 'pm', 'install-commit', session_id), **spargs)
-
-        except subprocess.CalledProcessError as e:
-            raise RuntimeError(f"Failed to install apk on device {device}:\n"
-                               f"{e.stdout.decode('utf-8') or e.stderr.decode('utf-8')}") from e
-        finally:
-            subprocess.run((*adb_args, 'shell', 'rm', '-rf', tmp_path), **spargs)
-
-
-class InstallLocation(Enum):
+            future.result()
+        except RuntimeError as e:
+            errors.append(e)
+    if len(errors) == 1:
+        raise errors[0]
+    elif errors:
+        raise RuntimeError('\n'.join(map(str, errors))) from errors[0]
+
+
+class InstallLocation(str, Enum):
     """
     Where the application can be installed on external storage, internal only or auto.
 
@@ -251,19 +383,13 @@ class InstallLocation(Enum):
     def _missing_(cls, value):
         return cls.AUTO
 
-    def __eq__(self, other):
-        if isinstance(other, str):
-            return self.value == other
-        return super().__eq__(other)
-
-    def __hash__(self):
-        return hash(self.value)
-
-    def __repr__(self):
+    def __str__(self):
         return f'InstallLocation.{self.name}'
 
+    __repr__ = __str__
+
 
-class Abi(Enum):
+class Abi(str, Enum):
     """
     Android supported ABIs.
 
@@ -299,17 +425,11 @@ class Abi(Enum):
     def _missing_(cls, value):
         return cls.UNKNOWN
 
-    def __eq__(self, other):
-        if isinstance(other, str):
-            return self.value == other
-        return super().__eq__(other)
-
-    def __hash__(self):
-        return hash(self.value)
-
-    def __repr__(self):
+    def __str__(self):
         return f'Abi.{self.name}'
 
+    __repr__ = __str__
+
 
 _compatibility_map = {
     Abi.X86_64: frozenset({Abi.X86, Abi.ARM64, Abi.ARM7, Abi.ARM}),
@@ -319,6 +439,9 @@ _compatibility_map = {
     Abi.ARM: frozenset(),
     Abi.UNKNOWN: frozenset(),
 }
+# value lookups that skip the Enum call machinery (and its _missing_ fallback) in the parsing hot paths
+_abis_by_value = {abi.value: abi for abi in Abi}
+_install_locations_by_value = {location.value: location for location in InstallLocation}
 
 
 class SplitType(Enum):
@@ -337,26 +460,206 @@ class SplitType(Enum):
     OTHER = 'other'
 
 
-_extraction_patterns = {
-    'package_name': r'package: name=\'([^\']+)\'',
-    'version_code': r'versionCode=\'([^\']+)\'',
-    'version_name': r'versionName=\'([^\']+)\'',
-    'min_sdk_version': r'sdkVersion:\'([^\']+)\'',
-    'target_sdk_version': r'targetSdkVersion:\'([^\']+)\'',
-    'install_location': r'install-location:\'([^\']+)\'',
-    'labels': r'application-label-([a-z]{2}):\'' + r'([^\']+)\'',
-    'permissions': r'uses-permission: name=\'([^\']+)\'',
-    'libraries': r'uses-library(?:-not-required)?:\'([^\']+)\'',
-    'features': r'uses-feature(?:-not-required)?: name=\'([^\']+)\'',
-    'launchable_activity': r'launchable-activity: name=\'([^\']+)\'',
-    'supported_screens': r'supports-screens: \'([a-z\'\s]+)\'',
-    'supports_any_density': r'supports-any-density: \'([^\']+)\'',
-    'langs': r'locales: \'([a-zA-Z0-9\'\s\-\_]+)\'',
-    'densities': r'densities: \'([0-9\'\s]+)\'',
-    'abis': r'native-code: (.*)',
-    'icons': r'application-icon-([0-9]+):\'' + r'([^\']+)\'',
-    'split_name': r'split=\'([^\']+)\'',
+def _parse_package(line: bytes, data: Dict[str, list]) -> None:
+    """Parse the ``package:`` line (``package: name='...' versionCode='...' ...``)."""
+    parts = line.split(b"'")
+    attrs = {key.rsplit(b' ', 1)[-1].rstrip(b'='): value for key, value in zip(parts[::2], parts[1::2])}
+    for name, attr in (('package_name', b'name'), ('version_code', b'versionCode'),
+                       ('version_name', b'versionName'), ('split_name', b'split')):
+        value = attrs.get(attr)
+        if value:
+            data[name].append(value.decode())
+
+
+def _quoted_parser(name: str) -> Callable[[bytes, Dict[str, list]], None]:
+    """Get a parser that collects the first quoted value of the line (``key:'value'`` or ``key: name='value'``)."""
+    def parse(line: bytes, data: Dict[str, list]) -> None:
+        value = line.split(b"'", 2)[1]
+        if value:
+            data[name].append(value.decode())
+    return parse
+
+
+def _list_parser(name: str) -> Callable[[bytes, Dict[str, list]], None]:
+    """Get a parser that collects the inner text of a list of quoted values (``key: 'a' 'b'`` -> ``a' 'b``)."""
+    def parse(line: bytes, data: Dict[str, list]) -> None:
+        value = line.partition(b':')[2].strip()[1:-1]
+        if value:
+            data[name].append(value.decode())
+    return parse
+
+
+_line_parsers = {  # line key (the text before the first colon): parser
+    b'package': _parse_package,
+    b'sdkVersion': _quoted_parser('min_sdk_version'),
+    b'targetSdkVersion': _quoted_parser('target_sdk_version'),
+    b'install-location': _quoted_parser('install_location'),
+    b'uses-permission': _quoted_parser('permissions'),
+    b'uses-library': _quoted_parser('libraries'),
+    b'uses-library-not-required': _quoted_parser('libraries'),
+    b'uses-feature': _quoted_parser('features'),
+    b'uses-feature-not-required': _quoted_parser('features'),
+    b'launchable-activity': _quoted_parser('launchable_activity'),
+    b'supports-screens': _list_parser('supported_screens'),
+    b'supports-any-density': _quoted_parser('supports_any_density'),
+    b'locales': _list_parser('langs'),
+    b'densities': _list_parser('densities'),
+    b'native-code': lambda line, data: data['abis'].append(line.partition(b': ')[2].decode()),
 }
+_extracted_fields = (
+    'package_name', 'version_code', 'version_name', 'min_sdk_version', 'target_sdk_version', 'install_location',
+    'labels', 'permissions', 'libraries', 'features', 'launchable_activity', 'supported_screens',
+    'supports_any_density', 'langs', 'densities', 'abis', 'icons', 'split_name'
+)
+
+
+def _parse_badging(lines: Iterable[bytes]) -> Dict[str, list]:
+    """
+    Helper function to parse the output of ``aapt d badging`` line by line.
+
+    The output is parsed as bytes; only the extracted values are decoded.
+
+    Args:
+        lines: The raw output lines of the aapt command.
+    Returns:
+        A dict of ``{field: [values]}``. ``labels`` and ``icons`` values are ``(key, value)`` tuples.
+    """
+    data = {name: [] for name in _extracted_fields}
+    for line in lines:
+        line = line.rstrip(b'\r\n')
+        key = line.partition(b':')[0]
+        parser = _line_parsers.get(key)
+        if parser is not None:
+            parser(line, data)
+        elif key.startswith(b'application-label-'):  # application-label-xx:'label'
+            lang, label = key[18:], line[len(key) + 2:-1]
+            if len(lang) == 2 and lang.isalpha() and lang.islower() and label:
+                data['labels'].append((lang.decode(), label.decode()))
+        elif key.startswith(b'application-icon-'):  # application-icon-160:'res/icon.png'
+            size, icon = key[17:], line[len(key) + 2:-1]
+            if size.isdigit() and icon:
+                data['icons'].append((size.decode(), icon.decode()))
+    return data
+
+
+_cache_dir: Optional[str] = None  # see set_cache_dir
+_cache_version = 1  # bump when the parsed fields change, so old cache entries are not used
+
+
+def set_cache_dir(path: Optional[Union[str, os.PathLike[str]]]) -> None:
+    """
+    Set a directory to keep the parsed aapt output of apks in, across runs (disabled by default).
+
+    The entries are keyed by the apk content, so an unchanged apk is not passed to aapt again, even from another path
+    (like the splits of an apkm that was extracted again).
+
+    >>> set_cache_dir(os.path.expanduser('~/.cache/apkfile'))
+
+    Args:
+        path: The cache directory (created if it does not exist), or ``None`` to disable the cache.
+    """
+    global _cache_dir
+    if path is not None:
+        path = os.fspath(path)
+        os.makedirs(path, exist_ok=True)
+    _cache_dir = path
+
+
+def _aapt_identity(aapt_path: Optional[str] = None) -> Optional[str]:
+    """
+    Helper function to fingerprint the aapt binary, for the disk cache keys.
+
+    Args:
+        aapt_path: The path to the aapt executable (If not specified, aapt will be searched in the PATH).
+    Returns:
+        A short digest of the real path, size and mtime of aapt, or ``None`` if aapt is not found.
+    """
+    try:
+        path = os.path.realpath(aapt_path or _get_program_path('aapt'))
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return hashlib.blake2b(f'{path}\0{stat.st_size}\0{stat.st_mtime_ns}'.encode(), digest_size=8).hexdigest()
+
+
+@lru_cache(maxsize=256)
+def _get_badging(apk_path: str, mtime_ns: int, size: int, aapt_path: Optional[str] = None) -> Dict[str, list]:
+    """
+    Helper function to get the parsed aapt output of an apk (cached).
+
+    The lines are parsed while aapt is still writing them. ``mtime_ns`` and ``size`` are not used directly, they are
+    part of the cache key, so a changed file is parsed again. The returned lists must not be mutated.
+
+    If a cache directory is set (see :func:`set_cache_dir`), the result is also stored there by the apk digest and
+    the aapt binary (different aapt versions can print different output). An entry that can't be read or doesn't have
+    the expected fields is parsed again and rewritten.
+    """
+    cache_dir = _cache_dir
+    aapt_id = None if cache_dir is None else _aapt_identity(aapt_path)
+    if aapt_id is None:
+        return _parse_badging(_iter_aapt(apk_path=apk_path, aapt_path=aapt_path))
+    cache_path = os.path.join(
+        cache_dir, f'{_file_digests(apk_path, "blake2b")[0]}-{size}-{aapt_id}.v{_cache_version}.json')
+    try:
+        with open(cache_path, 'rb') as f:
+            data = json.load(f)
+        if isinstance(data, dict) and all(isinstance(data.get(name), list) for name in _extracted_fields):
+            return data
+    except (OSError, ValueError):
+        pass
+    data = _parse_badging(_iter_aapt(apk_path=apk_path, aapt_path=aapt_path))
+    try:  # written to a temporary file first, so concurrent runs never read a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    except OSError:
+        return data  # the cache is best effort
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+    return data
+
+
+@lru_cache(maxsize=64)
+def _parse_abis(native_code: str) -> Tuple[Abi, ...]:
+    """
+    Helper function to convert a ``native-code`` value to abis (cached, apks share a few abi combinations).
+
+    Args:
+        native_code: The raw ``native-code`` value, e.g. ``'arm64-v8a' 'armeabi-v7a'``.
+    Returns:
+        A shared tuple of the abis.
+    """
+    return tuple(_abis_by_value.get(abi.replace("'", ""), Abi.UNKNOWN) for abi in native_code.split("' '"))
+
+
+_field_converters: Dict[str, Callable[[list], Any]] = {  # field: converter of the parsed values
+    'package_name': lambda values: values[0],
+    'version_code': lambda values: int(values[0]),
+    'version_name': lambda values: (values or (None,))[0],
+    'min_sdk_version': lambda values: int((values or (0,))[0]) or None,
+    'target_sdk_version': lambda values: int((values or (0,))[0]) or None,
+    'install_location': lambda values: _install_locations_by_value.get((values or ('auto',))[0], InstallLocation.AUTO),
+    'labels': dict,
+    'permissions': tuple,
+    'libraries': tuple,
+    'features': tuple,
+    'launchable_activity': lambda values: (values or (None,))[0],
+    'supported_screens': lambda values: tuple(values[0].split("' '")) if values else (),
+    'supports_any_density': lambda values: (values or (None,))[0] == 'true',
+    'langs': lambda values: tuple(lang.strip() for lang in values[0].split("' '") if lang.isascii() and
+                                  lang.replace('-', '').replace('+', '').isalnum()) if values else (),
+    'densities': lambda values: tuple(values[0].split("' '")) if values else (),
+    'split_name': lambda values: (values or (None,))[0],
+    'abis': lambda values: _parse_abis(values[0]) if values else (),
+    'icons': lambda values: {int(size): icon for size, icon in values},
+}
+_split_attrs = frozenset(('splits', 'permissions', 'features', 'libraries', 'labels', 'langs', 'abis'))  # need the splits
+_format_pattern = re.compile(r'{([a-zA-Z_\d]+)}', re.ASCII)
 
 
 class _BaseApkFile:
@@ -380,8 +683,11 @@ class _BaseApkFile:
         'split_name',
         'abis',
         'icons',
-        '_raw',
-        '_aapt_path'
+        '_data',
+        '_aapt_path',
+        '_size',
+        '_md5',
+        '_sha256'
     )
     package_name: str
     version_code: int
@@ -407,18 +713,48 @@ class _BaseApkFile:
 
     @property
     def size(self) -> int:
-        """Get the apk file size in bytes."""
-        return os.path.getsize(self.path)
+        """Get the apk file size in bytes (cached)."""
+        try:
+            return self._size
+        except AttributeError:
+            self._size = os.path.getsize(self.path)
+            return self._size
 
     @property
     def md5(self) -> str:
-        """Get the apk file md5."""
-        return hashlib.md5(open(self.path, 'rb').read()).hexdigest()
+        """Get the apk file md5 (cached, computed together with the sha256)."""
+        try:
+            return self._md5
+        except AttributeError:
+            self._md5, self._sha256 = _file_digests(self.path, 'md5', 'sha256')  # one read for both
+            return self._md5
 
     @property
     def sha256(self) -> str:
-        """Get the apk file sha256."""
-        return hashlib.sha256(open(self.path, 'rb').read()).hexdigest()
+        """Get the apk file sha256 (cached, computed together with the md5)."""
+        try:
+            return self._sha256
+        except AttributeError:
+            self._md5, self._sha256 = _file_digests(self.path, 'md5', 'sha256')
+            return self._sha256
+
+    def digest(self, algorithm: str = 'blake2b') -> str:
+        """
+        Get the apk file digest with any hashlib algorithm.
+
+        Use it for content fingerprints that don't have to be md5 or sha256 (``blake2b`` is much faster to compute).
+
+        >>> apk_file.digest()
+        >>> apk_file.digest('sha1')
+
+        Args:
+            algorithm: The name of the hashlib algorithm (default: ``blake2b``).
+        Returns:
+            The hex digest of the apk file.
+        Raises:
+            ValueError: If the algorithm is not supported by hashlib.
+        """
+        return _file_digests(self.path, algorithm)[0]
 
     def as_zip_file(self) -> ZipFile:
         """Get the apk file as a zip file."""
@@ -433,7 +769,8 @@ class _BaseApkFile:
             installer: Optional[str] = None,
             originating_uri: Optional[str] = None,
             adb_path: Optional[str] = None,
-            aapt_path: Optional[str] = None
+            aapt_path: Optional[str] = None,
+            max_workers: Optional[int] = None
     ):
         """
         Install apk(s) on a device using `adb <https://developer.android.com/studio/command-line/adb>`_.
@@ -450,6 +787,7 @@ class _BaseApkFile:
             originating_uri: The URI of the app that is performing the installation.
             adb_path: The path to the adb executable (If not specified, adb will be searched in the ``PATH``).
             aapt_path: The path to the aapt executable (If check is ``True``. If not specified, aapt will be searched in the ``PATH``).
+            max_workers: How many devices to install on at the same time (default: all of them, see :func:`install_apks`).
 
         Raises:
             FileNotFoundError: If adb is not installed (or if ``check`` is ``True`` and aapt is not installed or the file does not exist).
@@ -464,7 +802,8 @@ class _BaseApkFile:
             installer=installer,
             originating_uri=originating_uri,
             adb_path=adb_path,
-            aapt_path=aapt_path or self._aapt_path
+            aapt_path=aapt_path or self._aapt_path,
+            max_workers=max_workers
         )
 
     def rename(self, name: str):
@@ -480,7 +819,7 @@ class _BaseApkFile:
         Raises:
             AttributeError: If one of the format strings not in the file attrs, or the value is not a string or an int.
         """
-        format_strings = re.findall(r'{([a-zA-Z_\d]+)}', name)
+        format_strings = _format_pattern.findall(name)
         attrs = {k: getattr(self, k) for k in format_strings if isinstance(getattr(self, k), (str, int))}
         format_name = name.format(**attrs)
         new_path = os.path.join(os.path.dirname(self.path), format_name)
@@ -544,6 +883,7 @@ class ApkFile(_BaseApkFile):
         sha256: The SHA256 hash of the apk file.
     """
     split_name: Optional[str]
+    _dict_attrs = tuple(k for k in _BaseApkFile.__slots__ if not k.startswith('_'))
 
     def __init__(
             self,
@@ -571,7 +911,8 @@ class ApkFile(_BaseApkFile):
         self.path = path
         self._aapt_path = aapt_path
         try:
-            raw = get_raw_aapt(apk_path=self.path, aapt_path=aapt_path)
+            stat = os.stat(self.path)
+            data = _get_badging(apk_path=self.path, mtime_ns=stat.st_mtime_ns, size=stat.st_size, aapt_path=aapt_path)
         except RuntimeError as e:
             err_msg = str(e)
             if any(x in err_msg for x in ('Invalid file', 'AndroidManifest.xml')):
@@ -579,28 +920,16 @@ class ApkFile(_BaseApkFile):
             elif 'is neither a directory nor file' in err_msg:
                 raise FileNotFoundError(err_msg)
             raise
-        self._raw = raw
-        data = {name: re.findall(pattern, raw) for name, pattern in _extraction_patterns.items()}
-        self.package_name = data['package_name'][0]
-        self.version_code = int(data['version_code'][0])
-        self.version_name = (data.get('version_name') or (None,))[0]
-        self.min_sdk_version = int((data.get('min_sdk_version') or (0,))[0]) or None
-        self.target_sdk_version = int((data.get('target_sdk_version') or (0,))[0]) or None
-        self.install_location = InstallLocation(data.get('install_location') or ('auto',)[0])
-        self.labels = {lang: label for lang, label in data.get('labels', {})}
-        self.permissions = tuple(data.get('permissions', ()))
-        self.libraries = tuple(data.get('libraries', ()))
-        self.features = tuple(data.get('features', ()))
-        self.launchable_activity = (data.get('launchable_activity') or (None,))[0]
-        self.supported_screens = tuple(str(s) for s in re.split(r"'\s'", data['supports_screens'][0])) if \
-            data.get('supports_screens') else ()
-        self.supports_any_density = (data.get('supports_any_density') or (None,))[0] == 'true'
-        self.langs = tuple(lang.strip() for lang in re.split(r"'\s'", data['langs'][0]) if
-                           re.match(r'^[\dA-Za-z\-]+$', lang)) if data.get('langs') else ()
-        self.densities = tuple(str(d) for d in re.split(r"'\s'", data['densities'][0])) if data.get('densities') else ()
-        self.split_name = data.get('split_name')[0] if data.get('split_name') else None
-        self.abis = tuple(Abi(abi.replace("'", "")) for abi in re.split(r"'\s'", data['abis'][0])) if data.get('abis') else ()
-        self.icons = {int(size): icon for size, icon in data.get('icons', {})}
+        self._data = data
+
+    def __getattr__(self, name: str):
+        """Parse the aapt output fields lazily, on first access."""
+        converter = _field_converters.get(name)
+        if converter is None:
+            raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
+        value = converter(self._data[name])
+        setattr(self, name, value)
+        return value
 
     @property
     def is_split(self) -> bool:
@@ -631,30 +960,93 @@ class ApkFile(_BaseApkFile):
             path: Path to the directory to extract to.
             members: An optional list of names to extract. If not provided, all files will be extracted.
         """
-        self.as_zip_file().extractall(path=path, members=members)
+        with self.as_zip_file() as zip_file:
+            zip_file.extractall(path=path, members=members)
 
     def as_dict(self) -> Dict[str, Any]:
         """Return a dict representation of the apk file."""
-        return {k: getattr(self, k) for k in self.__slots__ if not k.startswith('_')}
+        return {k: getattr(self, k) for k in self._dict_attrs}
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(pkg={self.package_name!r}, version={self.version_code!r}" \
                f"{(f', split={self.split_name!r}' if self.is_split else '')})"
 
 
+def _parse_apks(
+        paths: Iterable[str],
+        aapt_path: Optional[str] = None,
+        skip_broken: bool = False
+) -> Tuple[Optional[ApkFile], ...]:
+    """
+    Helper function to parse many apks concurrently.
+
+    Each apk is parsed by its own aapt process, so the work runs in a thread pool (the GIL is released while
+    waiting on aapt).
+
+    Args:
+        paths: The paths to the apks.
+        aapt_path: The path to the aapt executable (If not specified, aapt will be searched in the PATH).
+        skip_broken: If True, broken apks are returned as ``None`` instead of raising.
+    Returns:
+        The parsed apks, in the same order as ``paths``.
+    Raises:
+        FileNotFoundError: If aapt binary or one of the apks not found.
+        FileExistsError: If one of the apks is not a valid apk file (and ``skip_broken`` is False).
+        RuntimeError: If aapt binary failed to run.
+    """
+    def parse(path: str) -> Optional[ApkFile]:
+        try:
+            return ApkFile(path=path, aapt_path=aapt_path)
+        except FileExistsError:
+            if not skip_broken:
+                raise
+            return None
+
+    paths = tuple(paths)
+    if len(paths) < 2:
+        return tuple(map(parse, paths))
+    with ThreadPoolExecutor() as executor:
+        return tuple(executor.map(parse, paths))
+
+
+def _is_extracted(zip_file: ZipFile, name: str, path: str) -> bool:
+    """
+    Helper function to check if a member of the zip file was already extracted to a directory.
+
+    Args:
+        zip_file: The zip file.
+        name: The name of the member.
+        path: The directory the member would be extracted to.
+    Returns:
+        Whether the extracted file exists with the same size and crc as the member.
+    """
+    info = zip_file.getinfo(name)
+    target = os.path.join(path, name)
+    try:
+        if os.path.getsize(target) != info.file_size:
+            return False
+        crc = 0
+        with open(target, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                crc = zlib.crc32(chunk, crc)
+    except OSError:
+        return False
+    return crc == info.CRC
+
+
 class _BaseZipApkFile(_BaseApkFile):
     __slots__ = (
         'base',
         'splits',
         'icon',
         'app_name',
-        '_zipfile',
         '_base_path',
         '_icon_path',
         '_extract_path',
         '_extracted',
+        '_splits_extracted',
         '_skip_broken_splits',
-        '_extract_condition'
+        '_extract_attrs'
     )
     base: ApkFile
     splits: Tuple[ApkFile]
@@ -667,7 +1059,7 @@ class _BaseZipApkFile(_BaseApkFile):
             manifest_json_path: str,
             base_apk_path: str,
             icon_path: str,
-            extract_condition: Callable[[Any, str], bool],
+            extract_attrs: Iterable[str],
             manifest_attrs: Optional[Dict[str, (str, type, bool)]] = None,
             extract_path: Optional[Union[str, os.PathLike[str]]] = None,
             aapt_path: Optional[Union[str, os.PathLike[str]]] = None,
@@ -683,38 +1075,38 @@ class _BaseZipApkFile(_BaseApkFile):
             icon_path: Relative path to the icon file in the archive. (Can contain format strings)
             manifest_attrs: A dict of attributes to extract from the manifest ``{attr: (key, type, is_required)}``
             extract_path: Path to extract the apk to. If not provided, a temporary directory will be created. (Can contain format strings)
-            extract_condition: A callable that takes the instance and the item name and returns a boolean if the files should be extracted.  The callable signature: ``(self, item_name) -> bool``
+            extract_attrs: The names of the attributes that are only available after the files are extracted.
             aapt_path: Path to the aapt binary.
             skip_broken_splits: If True, broken splits will be skipped.
         """
         if isinstance(path, os.PathLike):
             path = os.fspath(path)
         self.path = path
-        self._zipfile = ZipFile(self.path)
         try:
-            with self._zipfile.open(manifest_json_path) as f:
-                info = json.load(f)
-                self._base_path = base_apk_path.format(**info)
-                if manifest_attrs is not None:
-                    for attr, (key, typ, required) in manifest_attrs.items():
-                        setattr(self, attr, (typ(info[key]) if required else
-                                             (typ(info.get(key)) if key in info else None)))
+            with ZipFile(self.path) as zip_file:  # reopened on extraction, so no fd is held meanwhile
+                info = json.loads(zip_file.read(manifest_json_path))
+            self._base_path = base_apk_path.format(**info)
+            if manifest_attrs is not None:
+                for attr, (key, typ, required) in manifest_attrs.items():
+                    value = info[key] if required else info.get(key)
+                    setattr(self, attr, None if value is None else typ(value))
         except (KeyError, json.JSONDecodeError) as e:
             raise FileExistsError(f'Invalid file: {self.path}') from e
 
         self._extract_path = (extract_path or tempfile.mkdtemp()).format(**info)
         self._icon_path = icon_path.format(**info)
         self._extracted = False
+        self._splits_extracted = False
         self._aapt_path = aapt_path
         self._skip_broken_splits = skip_broken_splits
-        self._extract_condition = extract_condition
+        self._extract_attrs = frozenset(extract_attrs)
 
         if extract_path:
             self._extract()
 
     def __getattr__(self, name: str):
-        if self._extract_condition(self, name):
-            self._extract()
+        if name in self._extract_attrs:
+            self._extract(splits=name in _split_attrs)
             return object.__getattribute__(self, name)
         raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
 
@@ -727,46 +1119,68 @@ class _BaseZipApkFile(_BaseApkFile):
         """Delete the extracted files."""
         self.delete_extracted_files()
 
-    def _extract(self) -> None:
-        """Extract the files"""
-        if self._extracted:
+    def _extract(self, splits: bool = True) -> None:
+        """
+        Extract the files
+
+        Args:
+            splits: Whether to extract and parse the splits too, or only the base apk and the icon.
+        """
+        if self._splits_extracted or (self._extracted and not splits):
+            return
+        with ZipFile(self.path) as zip_file:
+            splits_paths = [name for name in zip_file.namelist()
+                            if name.endswith('.apk') and name != self._base_path] if splits else []
+            members = (*(() if self._extracted else (self._base_path, self._icon_path)), *splits_paths)
+            # files left in the extract path by a previous run are reused (reading them is cheaper than inflating)
+            zip_file.extractall(path=self._extract_path, members=[
+                member for member in members if not _is_extracted(zip_file, member, self._extract_path)])
+        base_path = os.path.join(self._extract_path, self._base_path)
+        splits_paths = [os.path.join(self._extract_path, split) for split in splits_paths]
+
+        apks = _parse_apks((*(() if self._extracted else (base_path,)), *splits_paths),
+                           aapt_path=self._aapt_path, skip_broken=self._skip_broken_splits)
+        if not self._extracted:
+            base, *apks = apks
+            self.base = base or ApkFile(path=base_path, aapt_path=self._aapt_path)  # a broken base is never skipped
+            self.icon = os.path.join(self._extract_path, self._icon_path)
+            for attr in ('package_name', 'version_code', 'version_name', 'min_sdk_version', 'target_sdk_version',
+                         'supported_screens', 'launchable_activity', 'densities', 'supports_any_density'):
+                setattr(self, attr, getattr(self.base, attr))
+            self._extracted = True
+        if not splits:
             return
-        splits_paths = list(filter(lambda x: x.endswith('.apk') and x != self._base_path, self._zipfile.namelist()))
-        self._zipfile.extractall(path=self._extract_path, members=(self._base_path, self._icon_path, *splits_paths))
-        self._extracted = True
-        self.base = ApkFile(path=os.path.join(self._extract_path, self._base_path), aapt_path=self._aapt_path)
-        self.icon = os.path.join(self._extract_path, self._icon_path)
-
-        splits = []
-        for split in splits_paths:
-            try:
-                splits.append(ApkFile(path=os.path.join(self._extract_path, split), aapt_path=self._aapt_path))
-            except FileExistsError:
-                if not self._skip_broken_splits:
-                    raise
-                os.unlink(os.path.join(self._extract_path, split))
-
-        self.splits = tuple(splits)
-        for attr in ('package_name', 'version_code', 'version_name', 'min_sdk_version', 'target_sdk_version',
-                     'supported_screens', 'launchable_activity', 'densities', 'supports_any_density'):
-            setattr(self, attr, getattr(self.base, attr))
-
-        for attr in ('permissions', 'features', 'libraries', 'langs', 'abis'):
-            setattr(self, attr, tuple(set(x for split in self.splits for x in
-                                          getattr(split, attr)) | set(getattr(self.base, attr))))
-
-        self.labels = {k: v for labels in [split.labels for split in self.splits]
-                       + [self.base.labels] for k, v in labels.items()}
+
+        for split, split_path in zip(apks, splits_paths):
+            if split is None:
+                os.unlink(split_path)
+        self.splits = tuple(split for split in apks if split is not None)
+
+        # merge the splits into the base values in a single pass (base labels take precedence)
+        merged = {attr: set(getattr(self.base, attr)) for attr in
+                  ('permissions', 'features', 'libraries', 'langs', 'abis')}
+        labels = {}
+        for split in self.splits:
+            for attr, values in merged.items():
+                values.update(getattr(split, attr))
+            labels.update(split.labels)
+        labels.update(self.base.labels)
+        for attr, values in merged.items():
+            setattr(self, attr, tuple(values))
+        self.labels = labels
+        self._splits_extracted = True
 
     def delete_extracted_files(self) -> None:
         """
         Delete the extracted files.
             - This will not delete the zip file, only the extracted files
             - The data will be remained in the object
+            - The files are extracted again when they are needed (e.g. ``install`` or the first access to ``splits``)
         """
         if not self._extracted:
             return
         shutil.rmtree(self._extract_path)
+        self._extracted = self._splits_extracted = False  # the next extraction starts from the base again
 
     def install(
             self,
@@ -777,7 +1191,8 @@ class _BaseZipApkFile(_BaseApkFile):
             installer: Optional[str] = None,
             originating_uri: Optional[str] = None,
             adb_path: Optional[str] = None,
-            aapt_path: Optional[str] = None
+            aapt_path: Optional[str] = None,
+            max_workers: Optional[int] = None
     ):
         self._extract()
         install_apks(
@@ -787,7 +1202,8 @@ class _BaseZipApkFile(_BaseApkFile):
             installer=installer,
             originating_uri=originating_uri,
             adb_path=adb_path,
-            aapt_path=aapt_path or self._aapt_path
+            aapt_path=aapt_path or self._aapt_path,
+            max_workers=max_workers
         )
         if delete_after_install:
             self.delete_extracted_files()
@@ -897,7 +1313,7 @@ class ApkmFile(_BaseZipApkFile):
                 'min_sdk_version': ('min_api', int, True),
                 'version_name': ('release_version', str, False),
             },
-            extract_condition=lambda _, item: item in (
+            extract_attrs=(
                 'base', 'splits', 'icon', 'target_sdk_version', 'permissions', 'features', 'libraries', 'labels',
                 'langs', 'abis', 'supported_screens', 'launchable_activity', 'densities', 'supports_any_density'
             ),
@@ -1007,7 +1423,7 @@ class XapkFile(_BaseZipApkFile):
             manifest_json_path='manifest.json',
             base_apk_path='{package_name}.apk',
             icon_path='icon.png',
-            extract_condition=lambda _, item: item in (
+            extract_attrs=(
                 'base', 'splits', 'icon', 'features', 'libraries', 'labels', 'langs', 'supported_screens', 'abis',
                 'launchable_activity', 'densities', 'supports_any_density'
             ),
@@ -1129,12 +1545,10 @@ class ApksFile(_BaseZipApkFile):
             'aapt_path': aapt_path,
             'base_apk_path': 'base.apk',
             'icon_path': 'icon.png',
-            'extract_condition': lambda slf, item: (item in (
-                'min_sdk_version', 'target_sdk_version') and slf.meta_version < 2) or item in (
-                                                       'base', 'splits', 'icon', 'features', 'permissions', 'libraries',
-                                                       'labels', 'langs', 'abis', 'supported_screens',
-                                                       'launchable_activity', 'densities', 'supports_any_density'
-                                                   ),
+            'extract_attrs': (
+                'base', 'splits', 'icon', 'features', 'permissions', 'libraries', 'labels', 'langs', 'abis',
+                'supported_screens', 'launchable_activity', 'densities', 'supports_any_density'
+            ),
             'manifest_attrs': {  # attr: (key, type, required)
                 'package_name': ('package', str, True),
                 'app_name': ('label', str, True),